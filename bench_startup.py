@@ -0,0 +1,98 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+
+HEAVY_MODULES = ["streamlit", "pandas", "numpy", "joblib", "catboost", "ui_config", "data_schema", "valuation"]
+
+_IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import {module}
+print(time.perf_counter() - t0)
+"""
+
+_RENDER_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+t0 = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout={timeout})
+at.run()
+first_render_s = time.perf_counter() - t0
+
+t1 = time.perf_counter()
+at.button[0].click().run()
+first_prediction_s = time.perf_counter() - t1
+
+print(json.dumps({{
+    "first_render_s": first_render_s,
+    "first_prediction_s": first_prediction_s,
+    "exceptions": [str(e.value) for e in at.exception],
+}}))
+"""
+
+
+def _run(code: str) -> str:
+    # Każdy pomiar w świeżym procesie - inaczej mierzymy cache sys.modules
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if res.returncode != 0:
+        raise RuntimeError(res.stderr.strip().splitlines()[-1] if res.stderr else "błąd")
+    return res.stdout.strip().splitlines()[-1]
+
+
+def measure_imports(modules: list[str], repeats: int) -> dict:
+    out = {}
+    for m in modules:
+        times = []
+        for _ in range(repeats):
+            try:
+                times.append(float(_run(_IMPORT_SNIPPET.format(module=m))))
+            except RuntimeError as e:
+                print(f"[INFO] Pomijam import {m}: {e}")
+                break
+        if times:
+            out[m] = min(times)
+    return out
+
+
+def measure_render(timeout: float) -> dict:
+    return json.loads(_run(_RENDER_SNIPPET.format(timeout=timeout)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pomiar czasu importów i pierwszego renderu app.py")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="Wynik jako JSON")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    result = {"imports_s": measure_imports(HEAVY_MODULES, args.repeats)}
+    try:
+        result["app"] = measure_render(args.timeout)
+    except RuntimeError as e:
+        print(f"[INFO] Pomijam pomiar renderu: {e}")
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print("\n===== Czas importu (zimny proces, min z powtórzeń) =====")
+    for m, t in sorted(result["imports_s"].items(), key=lambda kv: -kv[1]):
+        print(f"{m:<12} {t * 1000:8.1f} ms")
+
+    if "app" in result:
+        print("\n===== app.py =====")
+        print(f"Pierwszy render:     {result['app']['first_render_s'] * 1000:8.1f} ms")
+        print(f"Pierwsza predykcja:  {result['app']['first_prediction_s'] * 1000:8.1f} ms")
+        for exc in result["app"]["exceptions"]:
+            print(f"[INFO] Wyjątek w aplikacji: {exc}")
+
+    print(f"\n[OK] Pomiar zakończony w {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
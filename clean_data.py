@@ -1,6 +1,11 @@
 import re
+from collections import deque
+
+import numpy as np
 import pandas as pd
 
+from data_schema import print_error_summary, validate_frame
+
 
 VOIVODESHIPS = {
     "dolnośląskie":        ["dolnośląskie", "dolnoslaskie", "dolno slaskie", "dolno-slaskie", "dolnoślaskie"],
@@ -21,6 +26,18 @@ VOIVODESHIPS = {
     "zachodniopomorskie":  ["zachodniopomorskie", "zachodnio pomorskie", "zachodnio-pomorskie"],
 }
 
+# Klucz kanoniczny ogłoszenia (ten sam samochód wrzucony kilka razy)
+DEDUP_KEY_COLS = [
+    "Vehicle_brand", "Vehicle_model", "Production_year", "Mileage_km",
+    "Power_HP", "Offer_location", "Price",
+]
+
+# Bloki dla near-duplicate (porównujemy tylko w obrębie marka/model)
+NEAR_DUP_BLOCK_COLS = ["Vehicle_brand", "Vehicle_model"]
+NEAR_DUP_EXACT_COLS = ["Production_year", "Power_HP"]
+NEAR_DUP_MILEAGE_TOL_KM = 500
+NEAR_DUP_PRICE_TOL = 0.01
+
 
 def _normalize_text(text: str) -> str:
     t = text.lower()
@@ -41,10 +58,88 @@ def extract_voivodeship(text) -> str:
     return "Brak danych"
 
 
+def _canonical_key_frame(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    key = pd.DataFrame(index=df.index)
+    for c in cols:
+        col = df[c]
+        if pd.api.types.is_numeric_dtype(col):
+            key[c] = pd.to_numeric(col, errors="coerce").round(0)
+        else:
+            key[c] = (
+                col.astype(str)
+                .str.strip()
+                .str.lower()
+                .str.replace(r"\s+", " ", regex=True)
+            )
+    return key
+
+
+def row_hashes(df: pd.DataFrame, cols: list[str] = DEDUP_KEY_COLS) -> pd.Series:
+    existing = [c for c in cols if c in df.columns]
+    key = _canonical_key_frame(df, existing)
+    return pd.util.hash_pandas_object(key, index=False)
+
+
+def drop_exact_duplicates(df: pd.DataFrame, cols: list[str] = DEDUP_KEY_COLS) -> tuple[pd.DataFrame, int]:
+    # Wiersze z brakiem w którejś kolumnie klucza (np. cena odrzucona przez
+    # walidację schematu) nie są kandydatami - NaN == NaN dałoby fałszywe duplikaty.
+    existing = [c for c in cols if c in df.columns]
+    complete = df[existing].notna().all(axis=1).to_numpy()
+    hashes = row_hashes(df, existing)
+    dup_mask = hashes.duplicated(keep="first").to_numpy() & complete
+    return df.loc[~dup_mask], int(dup_mask.sum())
+
+
+def drop_near_duplicates(
+    df: pd.DataFrame,
+    mileage_tol_km: float = NEAR_DUP_MILEAGE_TOL_KM,
+    price_tol: float = NEAR_DUP_PRICE_TOL,
+) -> tuple[pd.DataFrame, int]:
+    # Sortujemy w blokach marka/model/rok/moc po przebiegu i skanujemy zachłannie:
+    # wiersz jest duplikatem, jeśli mieści się w tolerancji ceny względem któregoś
+    # zachowanego wiersza z okna ±mileage_tol_km; inaczej sam zostaje zachowany.
+    # Okno przesuwa się z przebiegiem, więc inne ogłoszenie z tym samym
+    # przebiegiem nie przerywa łańcucha. Sort O(n log n) + przebieg O(n * okno).
+    # Wiersze bez przebiegu/ceny nie biorą udziału i nigdy nie są usuwane.
+    block_cols = [c for c in NEAR_DUP_BLOCK_COLS + NEAR_DUP_EXACT_COLS if c in df.columns]
+    if not block_cols or "Mileage_km" not in df.columns or "Price" not in df.columns:
+        return df, 0
+
+    key = _canonical_key_frame(df, block_cols)
+    block_id = pd.util.hash_pandas_object(key, index=False).to_numpy()
+    mileage = pd.to_numeric(df["Mileage_km"], errors="coerce").to_numpy(dtype=float)
+    price = pd.to_numeric(df["Price"], errors="coerce").to_numpy(dtype=float)
+
+    candidates = np.flatnonzero(~(np.isnan(mileage) | np.isnan(price)))
+    order = candidates[np.lexsort((price[candidates], mileage[candidates], block_id[candidates]))]
+    b_list, m_list, p_list = block_id[order].tolist(), mileage[order].tolist(), price[order].tolist()
+
+    dup_sorted = np.zeros(len(order), dtype=bool)
+    kept = deque()  # (przebieg, cena) zachowanych wierszy w oknie bieżącego bloku
+    current_b = None
+    for i in range(len(order)):
+        b, m, p = b_list[i], m_list[i], p_list[i]
+        if b != current_b:
+            kept.clear()
+            current_b = b
+        while kept and m - kept[0][0] > mileage_tol_km:
+            kept.popleft()
+        if any(abs(p - kp) <= price_tol * max(kp, 1.0) for _, kp in kept):
+            dup_sorted[i] = True
+        else:
+            kept.append((m, p))
+
+    dup_mask = np.zeros(len(df), dtype=bool)
+    dup_mask[order] = dup_sorted
+    return df.loc[~dup_mask], int(dup_mask.sum())
+
+
 def main(
     input_path: str = "data/Car_sale_ads.csv",
     output_path: str = "data/Car_sale_ads_cleaned_v2.csv",
     eur_rate: float = 4.6,
+    dedup: bool = True,
+    near_dedup: bool = False,
 ):
     df_raw = pd.read_csv(input_path)
     df = df_raw.copy()
@@ -62,27 +157,12 @@ def main(
     else:
         print("[INFO] Brak kolumn do usunięcia z listy.")
 
-    # Uzupełnianie braków w kluczowych kategorycznych
-    for col in ["Origin_country", "First_owner", "Drive"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("Brak danych")
-        else:
-            print(f"[INFO] Brak kolumny '{col}' w danych.")
-
-    # Doors_number -> int
-    if "Doors_number" in df.columns:
-        df["Doors_number"] = (
-            df["Doors_number"]
-            .astype(str)
-            .str.extract(r"(\d+)", expand=False)
-            .astype(float)
-        )
-        df["Doors_number"] = df["Doors_number"].fillna(0).astype(int)
+    # Typy, braki, zakresy i kategorie wg wspólnego schematu (data_schema.py)
+    df, schema_errors = validate_frame(df, only_known=True)
+    print_error_summary(schema_errors, "clean_data")
 
     # Waluta EUR -> PLN
     if "Currency" in df.columns and "Price" in df.columns:
-        df["Price"] = pd.to_numeric(df["Price"], errors="coerce").astype(float)
-
         eur_mask = df["Currency"].astype(str).str.upper() == "EUR"
         n_eur = int(eur_mask.sum())
         print(f"[INFO] Liczba ogłoszeń w EUR przed konwersją: {n_eur}")
@@ -94,9 +174,39 @@ def main(
     else:
         print("[INFO] Brak Currency/Price, pomijam konwersję waluty.")
 
+    # Deduplikacja (po konwersji waluty, żeby ceny były porównywalne)
+    if dedup:
+        n_before = len(df)
+        df, n_exact = drop_exact_duplicates(df)
+        print(f"[OK] Usunięto duplikaty: {n_exact} z {n_before} wierszy")
+
+        if near_dedup:
+            df, n_near = drop_near_duplicates(df)
+            print(
+                f"[OK] Usunięto prawie-duplikaty: {n_near} "
+                f"(przebieg ±{NEAR_DUP_MILEAGE_TOL_KM} km, cena ±{NEAR_DUP_PRICE_TOL:.0%})"
+            )
+
     df.to_csv(output_path, index=False)
     print(f"[OK] Zapisano: {output_path} | shape={df.shape}")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Czyszczenie danych ogłoszeń")
+    parser.add_argument("--input", default="data/Car_sale_ads.csv")
+    parser.add_argument("--output", default="data/Car_sale_ads_cleaned_v2.csv")
+    parser.add_argument("--eur-rate", type=float, default=4.6, help="Kurs EUR -> PLN")
+    parser.add_argument("--no-dedup", action="store_true", help="Pomiń usuwanie duplikatów")
+    parser.add_argument("--near-dedup", action="store_true",
+                        help="Usuń też prawie-duplikaty (przebieg/cena w tolerancji)")
+    args = parser.parse_args()
+
+    main(
+        input_path=args.input,
+        output_path=args.output,
+        eur_rate=args.eur_rate,
+        dedup=not args.no_dedup,
+        near_dedup=args.near_dedup,
+    )
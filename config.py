@@ -0,0 +1,6 @@
+import os
+
+
+# Ścieżki artefaktów modelu (bez ciężkich importów - używane też przez app.py przy starcie)
+MODEL_PATH = os.getenv("MODEL_PATH", "models/catboost_price.joblib")
+SCHEMA_PATH = os.getenv("SCHEMA_PATH", "models/feature_schema.joblib")
@@ -0,0 +1,290 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+MISSING_CAT = "Brak danych"
+MISSING_TOKENS = ["", "nan", "NaN", "None", "none", "<NA>"]
+
+VOIVODESHIP_NAMES = [
+    "dolnośląskie", "kujawsko-pomorskie", "lubelskie", "lubuskie",
+    "łódzkie", "małopolskie", "mazowieckie", "opolskie", "podkarpackie",
+    "podlaskie", "pomorskie", "śląskie", "świętokrzyskie",
+    "warmińsko-mazurskie", "wielkopolskie", "zachodniopomorskie",
+]
+
+# Deklaratywny opis kolumn wspólny dla czyszczenia, treningu i serwowania.
+#   kind:       "num" | "cat"
+#   dtype:      docelowy typ ("int" | "float" | "str")
+#   min/max:    dopuszczalny zakres (wartości spoza -> default + błąd)
+#   categories: zamknięty zbiór wartości (inne -> default + błąd)
+#   pattern:    regex wyciągający liczbę z tekstu (np. "5-drzwiowy")
+#   default:    wartość dla braków i błędów (None -> NaN)
+COLUMNS = {
+    "Price":            {"kind": "num", "dtype": "float", "min": 1, "max": 50_000_000, "default": None},
+    "Condition":        {"kind": "cat", "dtype": "str", "categories": ["New", "Used"], "default": MISSING_CAT},
+    "Vehicle_brand":    {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "Vehicle_model":    {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "Production_year":  {"kind": "num", "dtype": "int", "min": 1900, "max": 2021, "default": 0},
+    "Mileage_km":       {"kind": "num", "dtype": "float", "min": 0, "max": 10_000_000, "default": 0},
+    "Power_HP":         {"kind": "num", "dtype": "float", "min": 0, "max": 2000, "default": 0},
+    "Displacement_cm3": {"kind": "num", "dtype": "float", "min": 0, "max": 10_000, "default": 0},
+    "Fuel_type":        {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "Drive":            {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "Transmission":     {"kind": "cat", "dtype": "str", "categories": ["Automatic", "Manual"], "default": MISSING_CAT},
+    "Type":             {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "Doors_number":     {"kind": "num", "dtype": "int", "min": 0, "max": 10, "pattern": r"(\d+)", "default": 0},
+    "Colour":           {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "Origin_country":   {"kind": "cat", "dtype": "str", "default": MISSING_CAT},
+    "First_owner":      {"kind": "cat", "dtype": "str", "categories": ["Yes"], "default": MISSING_CAT},
+    "Offer_location":   {"kind": "cat", "dtype": "str", "categories": VOIVODESHIP_NAMES, "default": MISSING_CAT},
+}
+
+ERROR_COLUMNS = ["row", "column", "value", "error"]
+
+# Ogólne specyfikacje dla kolumn spoza schematu
+GENERIC_CAT = {"kind": "cat", "default": MISSING_CAT}
+GENERIC_NUM = {"kind": "num", "default": 0}
+
+# Do tylu wierszy (serwowanie pojedynczych ogłoszeń) koercja idzie po listach
+# Pythona - przy 1 wierszu narzut operacji pandas na kolumnę dominuje.
+SMALL_FRAME_ROWS = 64
+
+_MISSING_TOKENS = frozenset(MISSING_TOKENS)
+_SPEC_CACHE = {}
+
+
+def _is_text(s: pd.Series) -> bool:
+    # object (pandas < 3) albo dedykowany dtype str (pandas >= 3)
+    return pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype)
+
+
+def _compiled(spec: dict) -> tuple:
+    # (dozwolone kategorie, regex) liczone raz na spec, nie przy każdym wywołaniu
+    hit = _SPEC_CACHE.get(id(spec))
+    if hit is None or hit[0] is not spec:
+        categories = spec.get("categories")
+        allowed = frozenset(categories) | {spec.get("default", MISSING_CAT)} if categories else None
+        regex = re.compile(spec["pattern"]) if spec.get("pattern") else None
+        hit = _SPEC_CACHE[id(spec)] = (spec, allowed, regex)
+    return hit[1], hit[2]
+
+
+def _is_missing(v) -> bool:
+    return v is None or v is pd.NA or v is pd.NaT or (isinstance(v, (float, np.floating)) and v != v)
+
+
+def _collect(errors: list, col: str, values: pd.Series, mask: np.ndarray, error: str):
+    if mask.any():
+        errors.append(pd.DataFrame({
+            "row": values.index[mask],
+            "column": col,
+            "value": values.to_numpy()[mask],
+            "error": error,
+        }))
+
+
+def _coerce_num(s: pd.Series, spec: dict, col: str, errors: list) -> pd.Series:
+    default = np.nan if spec.get("default") is None else spec["default"]
+
+    if spec.get("pattern"):
+        raw = s.astype(str).str.extract(spec["pattern"], expand=False)
+        missing = s.isna().to_numpy()
+    else:
+        raw = s
+        missing = s.isna()
+        if _is_text(s):
+            # tekstowe znaczniki braków tylko dla kolumn tekstowych
+            missing |= s.isin(MISSING_TOKENS)
+        missing = missing.to_numpy()
+
+    out = pd.to_numeric(raw, errors="coerce").astype(float)
+    bad_parse = out.isna().to_numpy() & ~missing
+    _collect(errors, col, s, bad_parse, "not_numeric")
+
+    values = out.to_numpy()
+    lo, hi = spec.get("min"), spec.get("max")
+    out_of_range = np.zeros(len(values), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        if lo is not None:
+            out_of_range |= values < lo
+        if hi is not None:
+            out_of_range |= values > hi
+    _collect(errors, col, s, out_of_range, "out_of_range")
+
+    values = np.where(np.isnan(values) | out_of_range, default, values)
+    out = pd.Series(values, index=s.index, name=s.name)
+    was_int = pd.api.types.is_integer_dtype(s)
+    if (spec.get("dtype") == "int" or was_int) and not out.isna().any():
+        out = out.astype("int64")
+    return out
+
+
+def _coerce_cat(s: pd.Series, spec: dict, col: str, errors: list) -> pd.Series:
+    default = spec.get("default", MISSING_CAT)
+    out = s.astype(object).where(s.notna(), default).astype(str).str.strip()
+    out = out.mask(out.isin(MISSING_TOKENS), default)
+
+    allowed, _ = _compiled(spec)
+    if allowed:
+        unknown = (~out.isin(allowed)).to_numpy()
+        _collect(errors, col, s, unknown, "unknown_category")
+        out = out.mask(unknown, default)
+    return out
+
+
+def _to_number(v) -> float:
+    # skalarny odpowiednik pd.to_numeric(errors="coerce")
+    if isinstance(v, (int, float, np.number)):
+        return float(v)
+    if isinstance(v, str):
+        try:
+            return float(v)
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def _coerce_num_list(values: list, index, spec: dict, col: str, was_int: bool, errors: list):
+    default = np.nan if spec.get("default") is None else spec["default"]
+    lo, hi = spec.get("min"), spec.get("max")
+    _, regex = _compiled(spec)
+
+    out, bad_parse, out_of_range = [], [], []
+    for row, v in zip(index, values):
+        if _is_missing(v) or (regex is None and isinstance(v, str) and v in _MISSING_TOKENS):
+            out.append(default)
+            continue
+        if regex is not None:
+            m = regex.search(str(v))
+            x = _to_number(m.group(1)) if m else np.nan
+        else:
+            x = _to_number(v)
+        if x != x:
+            bad_parse.append((row, col, v, "not_numeric"))
+            x = default
+        elif (lo is not None and x < lo) or (hi is not None and x > hi):
+            out_of_range.append((row, col, v, "out_of_range"))
+            x = default
+        out.append(x)
+    errors.extend(bad_parse + out_of_range)
+
+    arr = np.array(out, dtype=float)
+    if (spec.get("dtype") == "int" or was_int) and not np.isnan(arr).any():
+        arr = arr.astype("int64")
+    return arr
+
+
+def _coerce_cat_list(values: list, index, spec: dict, col: str, errors: list) -> list:
+    default = spec.get("default", MISSING_CAT)
+    allowed, _ = _compiled(spec)
+
+    out = []
+    for row, v in zip(index, values):
+        x = default if _is_missing(v) else str(v).strip()
+        if x in _MISSING_TOKENS:
+            x = default
+        elif allowed and x not in allowed:
+            errors.append((row, col, v, "unknown_category"))
+            x = default
+        out.append(x)
+    return out
+
+
+def _column_spec(col: str, columns: dict, cat_hint: set, num_hint: set, s: pd.Series):
+    spec = columns.get(col)
+    if spec is not None:
+        return spec
+    if col in cat_hint:
+        return GENERIC_CAT
+    if col in num_hint:
+        return GENERIC_NUM
+    if _is_text(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        return GENERIC_CAT
+    if pd.api.types.is_numeric_dtype(s):
+        return GENERIC_NUM
+    return None
+
+
+def _validate_small(df: pd.DataFrame, columns: dict, cat_hint: set, num_hint: set, only_known: bool):
+    # Ta sama semantyka co ścieżka wektorowa, ale kolumny jako listy Pythona
+    # i jeden DataFrame na końcu.
+    data = {}
+    errors = []
+    index = df.index
+    for col in df.columns:
+        s = df[col]
+        if only_known and col not in columns:
+            spec = None
+        else:
+            spec = _column_spec(col, columns, cat_hint, num_hint, s)
+        if spec is None:
+            data[col] = s
+        elif spec["kind"] == "num":
+            was_int = pd.api.types.is_integer_dtype(s)
+            data[col] = _coerce_num_list(s.tolist(), index, spec, col, was_int, errors)
+        else:
+            data[col] = _coerce_cat_list(s.tolist(), index, spec, col, errors)
+
+    out = pd.DataFrame(data, index=index, columns=df.columns)
+    return out, pd.DataFrame(errors, columns=ERROR_COLUMNS)
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    columns: dict = None,
+    cat_cols: list = None,
+    num_cols: list = None,
+    only_known: bool = False,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Sprawdza i koercuje cały DataFrame kolumnami (bez pętli po wierszach).
+    # Kolumny spoza schematu traktujemy ogólnie wg podpowiedzi cat_cols/num_cols
+    # albo wg dtype (only_known=True -> zostawiamy je bez zmian).
+    # Zwraca (df_po_koercji, tabela_błędów).
+    columns = COLUMNS if columns is None else columns
+    cat_hint = set(cat_cols or [])
+    num_hint = set(num_cols or [])
+
+    if len(df) <= SMALL_FRAME_ROWS:
+        return _validate_small(df, columns, cat_hint, num_hint, only_known)
+
+    out = df.copy()
+    errors = []
+    for col in out.columns:
+        if only_known and col not in columns:
+            continue
+        spec = _column_spec(col, columns, cat_hint, num_hint, out[col])
+        if spec is None:
+            continue
+
+        if spec["kind"] == "num":
+            out[col] = _coerce_num(out[col], spec, col, errors)
+        else:
+            out[col] = _coerce_cat(out[col], spec, col, errors)
+
+    if errors:
+        err_df = pd.concat(errors, ignore_index=True)
+    else:
+        err_df = pd.DataFrame(columns=ERROR_COLUMNS)
+    return out, err_df
+
+
+def summarize_errors(errors: pd.DataFrame) -> pd.DataFrame:
+    if errors.empty:
+        return pd.DataFrame(columns=["column", "error", "count"])
+    return (
+        errors.groupby(["column", "error"], sort=False)
+        .size()
+        .reset_index(name="count")
+        .sort_values("count", ascending=False)
+    )
+
+
+def print_error_summary(errors: pd.DataFrame, stage: str):
+    if errors.empty:
+        print(f"[OK] Walidacja schematu ({stage}): brak błędów")
+        return
+    n_rows = errors["row"].nunique()
+    print(f"[INFO] Walidacja schematu ({stage}): {len(errors)} błędów w {n_rows} wierszach")
+    print(summarize_errors(errors).to_string(index=False))
@@ -0,0 +1,329 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import MODEL_PATH, SCHEMA_PATH
+from telemetry import current_rss_mb, peak_rss_mb
+from ui_config import BRAND_TO_MODELS, CATEGORICAL_OPTIONS, FORM_LIMITS, TOP_BRANDS
+
+
+PERCENTILES = [50, 90, 95, 99]
+
+# Bardziej realistyczne środki rozkładów niż jednostajnie po całym zakresie formularza
+YEAR_MODE = 2012
+MILEAGE_PER_YEAR_KM = 15_000
+
+
+def _clip(x: float, field: str) -> float:
+    lim = FORM_LIMITS[field]
+    return min(max(x, lim["min_value"]), lim["max_value"])
+
+
+def generate_request(rng: random.Random) -> dict:
+    # Marki z początku TOP_BRANDS (najpopularniejsze) losujemy częściej
+    brand = rng.choices(TOP_BRANDS, weights=[1 / (i + 1) for i in range(len(TOP_BRANDS))])[0]
+    models = BRAND_TO_MODELS.get(brand) or ["Other"]
+
+    year = int(_clip(round(rng.triangular(1995, 2021, YEAR_MODE)), "Production_year"))
+    mileage = _clip(rng.gauss((2021 - year) * MILEAGE_PER_YEAR_KM, 40_000), "Mileage_km")
+    power = _clip(rng.lognormvariate(4.8, 0.35), "Power_HP")
+    displacement = _clip(rng.gauss(1800, 500), "Displacement_cm3")
+
+    def pick(col: str) -> str:
+        return rng.choice(CATEGORICAL_OPTIONS[col])
+
+    return {
+        "Condition": rng.choices(CATEGORICAL_OPTIONS["Condition"], weights=[1, 9])[0],
+        "Vehicle_brand": brand,
+        "Vehicle_model": rng.choice(models),
+        "Production_year": year,
+        "Mileage_km": int(round(mileage, -3)),
+        "Power_HP": float(round(power)),
+        "Displacement_cm3": float(round(displacement, -2)),
+        "Fuel_type": pick("Fuel_type"),
+        "Drive": pick("Drive"),
+        "Transmission": pick("Transmission"),
+        "Type": pick("Type"),
+        "Doors_number": rng.choice([3, 5, 5, 5, 4, 2]),
+        "Colour": pick("Colour"),
+        "Origin_country": pick("Origin_country"),
+        "First_owner": pick("First_owner"),
+        "Offer_location": pick("Offer_location"),
+    }
+
+
+# TRYBY WYWOŁANIA
+def make_inprocess_target(model_path: str, schema_path: str):
+    from valuation import load_artifacts, predict_prices
+
+    t0 = time.perf_counter()
+    model, schema, segment_bundle = load_artifacts(model_path, schema_path)
+    print(f"[INFO] Załadowano model w {time.perf_counter() - t0:.2f}s")
+
+    def call(rows: list[dict]):
+        preds, _, _ = predict_prices(model, schema, segment_bundle, rows)
+        return preds
+
+    return call
+
+
+def process_stats() -> dict:
+    # CPU (wszystkie wątki procesu, także CatBoost) i pamięć bieżącego procesu
+    return {"cpu_s": time.process_time(), "rss_mb": current_rss_mb(), "peak_rss_mb": peak_rss_mb()}
+
+
+def make_http_stats(url: str, timeout: float):
+    # Statystyki procesu serwera (GET /stats obok /predict)
+    stats_url = urllib.parse.urlunsplit(urllib.parse.urlsplit(url)._replace(path="/stats"))
+
+    def stats() -> dict:
+        with urllib.request.urlopen(stats_url, timeout=timeout) as resp:
+            return json.loads(resp.read())
+
+    return stats
+
+
+def make_http_target(url: str, timeout: float):
+    def call(rows: list[dict]):
+        body = json.dumps({"rows": rows}).encode("utf-8")
+        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())["prices"]
+
+    return call
+
+
+def serve(host: str, port: int, model_path: str, schema_path: str):
+    # Minimalny serwer HTTP z tą samą ścieżką predykcji co app.py (POST /predict)
+    call = make_inprocess_target(model_path, schema_path)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, payload: dict, status: int = 200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/stats":
+                self.send_error(404)
+                return
+            self._send_json(process_stats())
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self.send_error(404)
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prices = [float(p) for p in call(payload["rows"])]
+            except Exception as e:
+                self._send_json({"error": str(e)}, 400)
+                return
+            self._send_json({"prices": prices})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"[OK] Serwer predykcji: http://{host}:{port}/predict (statystyki: GET /stats)")
+    server.serve_forever()
+
+
+# POMIAR
+def _percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    k = (len(sorted_vals) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def run_load(call, stats, concurrency: int, duration_s: float, batch_size: int, warmup: int, seed: int) -> dict:
+    # stats: funkcja zwracająca cpu_s/rss_mb/peak_rss_mb procesu, który liczy
+    # predykcje (in-process: ten proces, http: serwer) albo None, gdy niedostępne
+    rng = random.Random(seed)
+    # pula zapytań generowana z góry - generator nie wpływa na pomiar
+    pool = [generate_request(rng) for _ in range(max(1000, batch_size * 50))]
+
+    for _ in range(warmup):
+        call(pool[:batch_size])
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+
+    def worker(wid: int):
+        wrng = random.Random(seed + wid)
+        local_lat, local_err = [], []
+        while time.perf_counter() < deadline:
+            rows = wrng.sample(pool, batch_size)
+            t0 = time.perf_counter()
+            try:
+                call(rows)
+                local_lat.append(time.perf_counter() - t0)
+            except Exception as e:
+                local_err.append(str(e))
+        with lock:
+            latencies.extend(local_lat)
+            errors.extend(local_err)
+
+    s0 = _safe_stats(stats)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(worker, range(concurrency)))
+    wall = time.perf_counter() - t0
+    s1 = _safe_stats(stats)
+
+    lat_ms = sorted(x * 1000 for x in latencies)
+    n_req = len(lat_ms)
+    result = {
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "duration_s": round(wall, 3),
+        "requests": n_req,
+        "errors": len(errors),
+        "error_sample": errors[:3],
+        "requests_per_s": round(n_req / wall, 2) if wall > 0 else None,
+        "valuations_per_s": round(n_req * batch_size / wall, 2) if wall > 0 else None,
+        "latency_ms": {
+            **{f"p{p}": round(_percentile(lat_ms, p), 3) for p in PERCENTILES},
+            "mean": round(sum(lat_ms) / n_req, 3) if n_req else float("nan"),
+            "max": round(lat_ms[-1], 3) if n_req else float("nan"),
+        },
+    }
+    if s0 is not None and s1 is not None:
+        result.update({
+            "cpu_util": round((s1["cpu_s"] - s0["cpu_s"]) / wall, 3) if wall > 0 else None,
+            "cpu_count": os.cpu_count(),
+            "rss_mb_before": s0["rss_mb"],
+            "rss_mb_after": s1["rss_mb"],
+            "peak_rss_mb": s1["peak_rss_mb"],
+        })
+    return result
+
+
+def _safe_stats(stats):
+    if stats is None:
+        return None
+    try:
+        return stats()
+    except Exception as e:
+        print(f"[INFO] Brak statystyk procesu serwującego: {e}")
+        return None
+
+
+def print_report(result: dict):
+    print(f"\n===== Load test: {result['label']} ({result['mode']}) =====")
+    print(f"{'conc':>5} {'req/s':>9} {'wyc/s':>9} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8} {'cpu':>6} {'err':>5}")
+    for r in result["runs"]:
+        lat = r["latency_ms"]
+        print(
+            f"{r['concurrency']:>5} {r['requests_per_s']:>9} {r['valuations_per_s']:>9} "
+            f"{lat['p50']:>8} {lat['p90']:>8} {lat['p95']:>8} {lat['p99']:>8} {lat['max']:>8} "
+            f"{str(r.get('cpu_util', '-')):>6} {r['errors']:>5}"
+        )
+    peak = result["runs"][-1].get("peak_rss_mb") if result["runs"] else None
+    if peak is not None:
+        print(f"Szczytowe RSS: {peak:.0f} MB")
+    print("(latencje w ms)")
+
+
+def compare(path_a: str, path_b: str):
+    # Porównanie A/B dwóch wyników (np. z/bez modeli segmentowych)
+    with open(path_a, encoding="utf-8") as fh:
+        a = json.load(fh)
+    with open(path_b, encoding="utf-8") as fh:
+        b = json.load(fh)
+
+    runs_b = {r["concurrency"]: r for r in b["runs"]}
+    print(f"\n===== A/B: {a['label']} -> {b['label']} =====")
+    print(f"{'conc':>5} {'req/s A':>9} {'req/s B':>9} {'Δ':>7} {'p95 A':>8} {'p95 B':>8} {'Δ':>7}")
+    for ra in a["runs"]:
+        rb = runs_b.get(ra["concurrency"])
+        if rb is None:
+            continue
+        d_tp = (rb["requests_per_s"] - ra["requests_per_s"]) / ra["requests_per_s"] if ra["requests_per_s"] else 0
+        p95a, p95b = ra["latency_ms"]["p95"], rb["latency_ms"]["p95"]
+        d_p95 = (p95b - p95a) / p95a if p95a else 0
+        print(
+            f"{ra['concurrency']:>5} {ra['requests_per_s']:>9} {rb['requests_per_s']:>9} {d_tp:>+7.0%} "
+            f"{p95a:>8} {p95b:>8} {d_p95:>+7.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test obciążeniowy wyceny samochodów")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="Uruchom test obciążeniowy")
+    p_run.add_argument("--url", default=None, help="np. http://127.0.0.1:8000/predict (domyślnie in-process)")
+    p_run.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    p_run.add_argument("--duration", type=float, default=10.0, help="Czas na poziom współbieżności [s]")
+    p_run.add_argument("--batch-size", type=int, default=1)
+    p_run.add_argument("--warmup", type=int, default=5)
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--timeout", type=float, default=30.0)
+    p_run.add_argument("--label", default=None, help="Nazwa konfiguracji (do porównań A/B)")
+    p_run.add_argument("--out", default=None, help="Zapis wyniku do JSON")
+    p_run.add_argument("--model", default=MODEL_PATH)
+    p_run.add_argument("--schema", default=SCHEMA_PATH)
+
+    p_serve = sub.add_parser("serve", help="Lokalny serwer HTTP z endpointem /predict")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8000)
+    p_serve.add_argument("--model", default=MODEL_PATH)
+    p_serve.add_argument("--schema", default=SCHEMA_PATH)
+
+    p_cmp = sub.add_parser("compare", help="Porównaj dwa wyniki JSON (A/B)")
+    p_cmp.add_argument("a")
+    p_cmp.add_argument("b")
+
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        serve(args.host, args.port, args.model, args.schema)
+        return
+    if args.cmd == "compare":
+        compare(args.a, args.b)
+        return
+
+    if args.url:
+        mode, call = "http", make_http_target(args.url, args.timeout)
+        stats = make_http_stats(args.url, args.timeout)
+    else:
+        mode, call = "inprocess", make_inprocess_target(args.model, args.schema)
+        stats = process_stats
+
+    result = {
+        "label": args.label or mode,
+        "mode": mode,
+        "url": args.url,
+        "model": args.model,
+        "ts": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "runs": [],
+    }
+    for c in args.concurrency:
+        print(f"[INFO] Współbieżność {c} przez {args.duration:.0f}s...")
+        result["runs"].append(run_load(call, stats, c, args.duration, args.batch_size, args.warmup, args.seed))
+
+    print_report(result)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, ensure_ascii=False)
+        print(f"[OK] Zapisano wynik: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import os
+import time
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+
+STATS_PATH = os.getenv("MARKET_STATS_PATH", "models/market_stats.joblib")
+
+# Segmenty rynku: nazwa -> kolumny klucza
+SEGMENTS = {
+    "brand_model_year": ["Vehicle_brand", "Vehicle_model", "Production_year"],
+    "brand_model": ["Vehicle_brand", "Vehicle_model"],
+    "location": ["Offer_location"],
+}
+
+QUANTILES = {"p10": 0.10, "median": 0.50, "p90": 0.90}
+
+
+def _segment_table(df: pd.DataFrame, keys: list[str], target: str) -> dict:
+    grouped = df.groupby(keys, sort=False, observed=True)[target]
+    table = grouped.quantile(list(QUANTILES.values())).unstack()
+    table.columns = list(QUANTILES.keys())
+    table["count"] = grouped.size()
+
+    # Płaski słownik krotka -> statystyki: lookup O(1), bez pandas przy odczycie
+    index = table.index if len(keys) > 1 else [(k,) for k in table.index]
+    out = {}
+    for key, p10, median, p90, count in zip(
+        index, table["p10"], table["median"], table["p90"], table["count"]
+    ):
+        key = tuple(k.item() if hasattr(k, "item") else k for k in key)
+        out[key] = {
+            "p10": float(p10),
+            "median": float(median),
+            "p90": float(p90),
+            "count": int(count),
+        }
+    return out
+
+
+def build_market_stats(df: pd.DataFrame, target: str = "Price") -> dict:
+    df = df[df[target].notna()]
+    stats = {"segments": {}}
+    for name, keys in SEGMENTS.items():
+        if all(k in df.columns for k in keys):
+            stats["segments"][name] = {"keys": keys, "table": _segment_table(df, keys, target)}
+        else:
+            print(f"[INFO] Pomijam segment '{name}' - brak kolumn {keys}")
+    stats["n_rows"] = int(len(df))
+    return stats
+
+
+def save_market_stats(stats: dict, path: str = STATS_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(stats, path)
+    n_keys = sum(len(s["table"]) for s in stats["segments"].values())
+    print(f"[OK] Zapisano statystyki rynku: {path} | segmentów={n_keys}")
+
+
+def load_market_stats(path: str = STATS_PATH) -> dict:
+    return joblib.load(path)
+
+
+def _normalize_key(keys: list[str], key: tuple) -> tuple:
+    # Rok z formularza/CLI przychodzi jako int albo str, w danych jest int
+    return tuple(
+        int(v) if name == "Production_year" else str(v)
+        for name, v in zip(keys, key)
+    )
+
+
+def query(stats: dict, segment: str, *key):
+    seg = stats["segments"].get(segment)
+    if seg is None:
+        return None
+    return seg["table"].get(_normalize_key(seg["keys"], key))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statystyki cen rynkowych per segment")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_build = sub.add_parser("build", help="Policz statystyki z danych CSV")
+    p_build.add_argument("--data", default="data/Car_sale_ads_cleaned_v2.csv")
+    p_build.add_argument("--out", default=STATS_PATH)
+
+    p_query = sub.add_parser("query", help="Odczytaj statystyki segmentu")
+    p_query.add_argument("segment", choices=list(SEGMENTS.keys()))
+    p_query.add_argument("key", nargs="+", help="Wartości klucza, np. BMW X5 2015")
+    p_query.add_argument("--stats", default=STATS_PATH)
+
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        from data_schema import validate_frame
+
+        df, _ = validate_frame(pd.read_csv(args.data), only_known=True)
+        save_market_stats(build_market_stats(df), args.out)
+        return
+
+    stats = load_market_stats(args.stats)
+    t0 = time.perf_counter()
+    res = query(stats, args.segment, *args.key)
+    dt_us = (time.perf_counter() - t0) * 1e6
+
+    if res is None:
+        print(f"[INFO] Brak danych dla segmentu {args.segment}: {args.key}")
+    else:
+        print(
+            f"mediana={res['median']:,.0f} PLN | p10={res['p10']:,.0f} | "
+            f"p90={res['p90']:,.0f} | ogłoszeń={res['count']}".replace(",", " ")
+        )
+    print(f"[INFO] Czas zapytania: {dt_us:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+SEGMENT_MODELS_FILE = "segment_models.joblib"
+
+# Grupy marek dla segmentacji "brand_group" (reszta -> "mass")
+BRAND_GROUPS = {
+    "luxury": [
+        "Porsche", "Maserati", "Bentley", "Ferrari", "Lamborghini", "Rolls-Royce",
+        "Aston Martin", "McLaren", "Land Rover", "Jaguar", "Cadillac", "Tesla",
+    ],
+    "premium": [
+        "BMW", "Audi", "Mercedes-Benz", "Volvo", "Lexus", "Infiniti", "Alfa Romeo",
+        "MINI", "Jeep", "Chrysler", "Saab",
+    ],
+}
+DEFAULT_BRAND_GROUP = "mass"
+
+BRAND_TO_GROUP = {brand: group for group, brands in BRAND_GROUPS.items() for brand in brands}
+
+SEGMENT_BY_CHOICES = ("brand_group", "Fuel_type")
+
+# Jedna pula wątków na proces (tworzona leniwie), współdzielona przez wszystkie predykcje
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1, thread_name_prefix="segment-predict"
+                )
+    return _EXECUTOR
+
+
+def segment_keys(X: pd.DataFrame, segment_by: str) -> pd.Series:
+    if segment_by == "brand_group":
+        return X["Vehicle_brand"].map(BRAND_TO_GROUP).fillna(DEFAULT_BRAND_GROUP)
+    if segment_by in X.columns:
+        return X[segment_by].astype(str)
+    raise ValueError(f"Nieznana segmentacja '{segment_by}'. Dostępne: {SEGMENT_BY_CHOICES}")
+
+
+def predict_routed(global_model, bundle: dict, X: pd.DataFrame, executor: ThreadPoolExecutor = None) -> np.ndarray:
+    # Router: wiersze z segmentem, który ma własny model, dostają mieszankę
+    # w * segment + (1 - w) * global. Partycje liczone równolegle w wątkach -
+    # CatBoost zwalnia GIL w predict.
+    if not bundle or not bundle.get("models"):
+        return np.asarray(global_model.predict(X), dtype=float)
+
+    keys = segment_keys(X, bundle["segment_by"]).to_numpy()
+    parts = {}
+    for seg in bundle["models"]:
+        if bundle["weights"].get(seg, 1.0) == 0.0:
+            continue
+        idx = np.flatnonzero(keys == seg)
+        if len(idx):
+            parts[seg] = idx
+
+    if not parts:
+        return np.asarray(global_model.predict(X), dtype=float)
+
+    # global potrzebny tylko dla wierszy poza segmentami albo z wagą < 1
+    need_global = np.ones(len(X), dtype=bool)
+    for seg, idx in parts.items():
+        if bundle["weights"].get(seg, 1.0) == 1.0:
+            need_global[idx] = False
+
+    ex = executor or _get_executor()
+    fut_global = ex.submit(global_model.predict, X[need_global]) if need_global.any() else None
+    fut_seg = {
+        seg: ex.submit(bundle["models"][seg].predict, X.iloc[idx])
+        for seg, idx in parts.items()
+    }
+
+    pred = np.zeros(len(X), dtype=float)
+    if fut_global is not None:
+        pred[need_global] = np.asarray(fut_global.result(), dtype=float)
+    for seg, fut in fut_seg.items():
+        idx = parts[seg]
+        w = bundle["weights"].get(seg, 1.0)
+        pred[idx] = w * np.asarray(fut.result(), dtype=float) + (1.0 - w) * pred[idx]
+    return pred
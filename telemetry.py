@@ -0,0 +1,182 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+RUNS_FILE = "runs.jsonl"
+ITERATION_LOG_EVERY = 10
+
+
+def current_rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    return None
+
+
+def peak_rss_mb():
+    if resource is not None:
+        # Linux: KB, macOS: bajty
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    return None
+
+
+class TrainingTelemetry:
+    # Zapisuje zdarzenia treningu jako JSON lines w trakcie działania
+    # i podsumowanie na końcu (także do runs.jsonl - porównanie między runami).
+
+    def __init__(self, out_dir: str, run_id: str = None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.out_dir / f"train_{self.run_id}.jsonl"
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.phases = {}
+        self.fits = {}
+
+    def emit(self, event: str, **fields):
+        record = {"ts": round(time.time(), 3), "run_id": self.run_id, "event": event, **fields}
+        self._fh.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._fh.flush()
+
+    @contextmanager
+    def phase(self, name: str):
+        t0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = time.process_time() - cpu0
+            self.phases[name] = self.phases.get(name, 0.0) + wall
+            self.emit(
+                "phase",
+                phase=name,
+                wall_s=round(wall, 4),
+                cpu_s=round(cpu, 4),
+                cpu_util=round(cpu / wall, 3) if wall > 0 else None,
+                rss_mb=current_rss_mb(),
+                peak_rss_mb=peak_rss_mb(),
+            )
+
+    def catboost_callback(self, name: str = "global", every: int = ITERATION_LOG_EVERY):
+        return _IterationCallback(self, name, every)
+
+    def summary(self, **extra) -> dict:
+        wall = time.perf_counter() - self._t0
+        cpu = time.process_time() - self._cpu0
+        summary = {
+            "run_id": self.run_id,
+            "total_wall_s": round(wall, 3),
+            "cpu_util": round(cpu / wall, 3) if wall > 0 else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "phases_s": {k: round(v, 4) for k, v in self.phases.items()},
+            "fits": self.fits,
+            **extra,
+        }
+        self.emit("summary", **summary)
+        return summary
+
+    def close(self, **extra) -> dict:
+        summary = self.summary(**extra)
+        self._fh.close()
+
+        runs_path = self.out_dir / RUNS_FILE
+        previous = _last_run(runs_path)
+        with open(runs_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(summary, ensure_ascii=False, default=str) + "\n")
+
+        print_summary(summary, previous)
+        print(f"[OK] Telemetria: {self.path}")
+        return summary
+
+
+class _IterationCallback:
+    # Callback CatBoost (after_iteration): RMSE train/valid, tempo iteracji, CPU, RSS
+    def __init__(self, telemetry: TrainingTelemetry, name: str, every: int):
+        self.telemetry = telemetry
+        self.name = name
+        self.every = max(1, every)
+        self._t_start = self._t_last = time.perf_counter()
+        self._cpu_last = time.process_time()
+        self._it_last = 0
+
+    def after_iteration(self, info) -> bool:
+        it = info.iteration
+        if it % self.every:
+            return True
+
+        now, cpu_now = time.perf_counter(), time.process_time()
+        dt = now - self._t_last
+        learn = info.metrics.get("learn", {}).get("RMSE")
+        valid = info.metrics.get("validation", {}).get("RMSE")
+        it_per_s = (it - self._it_last) / dt if dt > 0 else None
+
+        self.telemetry.emit(
+            "iteration",
+            model=self.name,
+            iteration=it,
+            train_rmse=learn[-1] if learn else None,
+            valid_rmse=valid[-1] if valid else None,
+            it_per_s=round(it_per_s, 2) if it_per_s else None,
+            cpu_util=round((cpu_now - self._cpu_last) / dt, 3) if dt > 0 else None,
+            rss_mb=current_rss_mb(),
+        )
+        self.telemetry.fits[self.name] = {
+            "iterations": it,
+            "it_per_s": round(it / (now - self._t_start), 2) if now > self._t_start else None,
+            "valid_rmse": valid[-1] if valid else None,
+        }
+        self._t_last, self._cpu_last, self._it_last = now, cpu_now, it
+        return True
+
+
+def _last_run(runs_path: Path):
+    if not runs_path.exists():
+        return None
+    # porównujemy tylko z ostatnim udanym runem
+    last = None
+    with open(runs_path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                run = json.loads(line)
+                if run.get("status", "ok") == "ok":
+                    last = run
+    return last
+
+
+def print_summary(summary: dict, previous: dict = None):
+    print("\n===== Telemetria treningu =====")
+    print(
+        f"Status: {summary.get('status', '-')} | Czas całkowity: {summary['total_wall_s']:.1f}s | "
+        f"CPU util: {summary['cpu_util']}"
+    )
+    if summary["peak_rss_mb"] is not None:
+        print(f"Szczytowe RSS: {summary['peak_rss_mb']:.0f} MB")
+
+    prev_phases = (previous or {}).get("phases_s", {})
+    print(f"{'faza':<14} {'czas [s]':>10} {'vs poprzedni':>14}")
+    for name, t in sorted(summary["phases_s"].items(), key=lambda kv: -kv[1]):
+        prev = prev_phases.get(name)
+        delta = f"{(t - prev) / prev:+.0%}" if prev else "-"
+        print(f"{name:<14} {t:>10.2f} {delta:>14}")
+
+    for name, fit in summary["fits"].items():
+        print(f"[INFO] Fit {name}: {fit['iterations']} iteracji, {fit['it_per_s']} it/s")
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from clean_data import drop_exact_duplicates, drop_near_duplicates
+
+
+def _block(mileages, prices):
+    n = len(mileages)
+    return pd.DataFrame({
+        "Vehicle_brand": ["BMW"] * n,
+        "Vehicle_model": ["X5"] * n,
+        "Production_year": [2015] * n,
+        "Power_HP": [249.0] * n,
+        "Offer_location": ["mazowieckie"] * n,
+        "Mileage_km": mileages,
+        "Price": prices,
+    })
+
+
+def test_near_duplicates_greedy_anchor():
+    # kotwica 0 -> 400 duplikat; 800 poza tolerancją -> nowa kotwica; 1200 duplikat 800
+    df = _block([0, 400, 800, 1200], [100_000.0] * 4)
+    out, n_removed = drop_near_duplicates(df, mileage_tol_km=500, price_tol=0.01)
+    assert n_removed == 2
+    assert out["Mileage_km"].tolist() == [0, 800]
+
+
+def test_near_duplicates_separate_blocks():
+    df = pd.concat([_block([1000], [50_000.0]), _block([1000], [50_000.0]).assign(Vehicle_model="X3")])
+    out, n_removed = drop_near_duplicates(df, mileage_tol_km=500, price_tol=0.01)
+    assert n_removed == 0
+    assert len(out) == 2
+
+
+def test_exact_duplicates_skip_missing_key():
+    df = _block([1000, 1000, 2000, 2000], [50_000.0, 50_000.0, np.nan, np.nan])
+    out, n_removed = drop_exact_duplicates(df)
+    assert n_removed == 1
+    assert out["Price"].isna().sum() == 2
+
+
+def test_near_duplicates_skip_missing_price():
+    # wiersz bez ceny nie może być kotwicą ani zostać usunięty
+    df = _block([100_000, 100_000, 100_300], [50_000.0, np.nan, 50_200.0])
+    out, n_removed = drop_near_duplicates(df, mileage_tol_km=500, price_tol=0.01)
+    assert n_removed == 1
+    assert out["Price"].isna().sum() == 1
+    assert out["Price"].dropna().tolist() == [50_000.0]
+
+
+def test_near_duplicates_interleaved_listing():
+    # inne ogłoszenie z tym samym przebiegiem nie przerywa porównania z 50 000
+    df = _block([100_000, 100_000, 100_200], [50_000.0, 80_000.0, 50_100.0])
+    out, n_removed = drop_near_duplicates(df, mileage_tol_km=500, price_tol=0.01)
+    assert n_removed == 1
+    assert sorted(out["Price"].tolist()) == [50_000.0, 80_000.0]
@@ -0,0 +1,151 @@
+import timeit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_schema
+from data_schema import COLUMNS, MISSING_CAT, validate_frame
+
+
+def _errors(errors: pd.DataFrame) -> set:
+    return set(zip(errors["row"], errors["column"], errors["error"]))
+
+
+def test_numeric_coercion_and_errors():
+    df = pd.DataFrame({
+        "Price": ["25000", "abc", None, "-5"],
+        "Mileage_km": [150_000, 20_000_000, np.nan, 0],
+    })
+    out, errors = validate_frame(df)
+
+    assert out["Price"].tolist()[0] == 25000.0
+    assert out["Price"].isna().tolist() == [False, True, True, True]
+    assert out["Mileage_km"].tolist() == [150_000.0, 0.0, 0.0, 0.0]
+    assert _errors(errors) == {
+        (1, "Price", "not_numeric"),
+        (3, "Price", "out_of_range"),
+        (1, "Mileage_km", "out_of_range"),
+    }
+
+
+def test_missing_tokens_are_not_errors():
+    df = pd.DataFrame({"Power_HP": ["nan", "", "150"], "Colour": ["None", " Black ", np.nan]})
+    out, errors = validate_frame(df)
+
+    assert out["Power_HP"].tolist() == [0.0, 0.0, 150.0]
+    assert out["Colour"].tolist() == [MISSING_CAT, "Black", MISSING_CAT]
+    assert errors.empty
+
+
+def test_category_errors():
+    df = pd.DataFrame({
+        "Transmission": ["Manual", "Semi-auto", None],
+        "Offer_location": ["mazowieckie", "Berlin", "śląskie"],
+    })
+    out, errors = validate_frame(df)
+
+    assert out["Transmission"].tolist() == ["Manual", MISSING_CAT, MISSING_CAT]
+    assert out["Offer_location"].tolist() == ["mazowieckie", MISSING_CAT, "śląskie"]
+    assert _errors(errors) == {
+        (1, "Transmission", "unknown_category"),
+        (1, "Offer_location", "unknown_category"),
+    }
+
+
+def test_doors_number_pattern():
+    df = pd.DataFrame({"Doors_number": ["5", "3-drzwiowe", None, "brak", 4.0]}, dtype=object)
+    out, errors = validate_frame(df)
+
+    assert out["Doors_number"].tolist() == [5, 3, 0, 0, 4]
+    assert out["Doors_number"].dtype == "int64"
+    assert _errors(errors) == {(3, "Doors_number", "not_numeric")}
+
+
+def test_only_known_leaves_other_columns():
+    df = pd.DataFrame({"Features": ["ABS", None], "Index": [1.0, np.nan], "Price": ["10", "20"]})
+    out, _ = validate_frame(df, only_known=True)
+
+    assert out["Features"].isna().tolist() == [False, True]
+    assert out["Index"].isna().tolist() == [False, True]
+    assert out["Price"].tolist() == [10.0, 20.0]
+
+
+def test_unknown_columns_by_dtype():
+    # kolumny spoza schematu: tekst -> kategoria bez NaN, liczby -> 0 za braki
+    df = pd.DataFrame({"Features": ["ABS", None, "nan"], "Extra_num": [1.5, np.nan, 2.0]})
+    out, errors = validate_frame(df)
+
+    assert out["Features"].tolist() == ["ABS", MISSING_CAT, MISSING_CAT]
+    assert out["Extra_num"].tolist() == [1.5, 0.0, 2.0]
+    assert errors.empty
+
+
+def test_unknown_columns_by_hints():
+    df = pd.DataFrame({"Code": [101, 102], "Score": ["7", "x"]})
+    out, errors = validate_frame(df, cat_cols=["Code"], num_cols=["Score"])
+
+    assert out["Code"].tolist() == ["101", "102"]
+    assert out["Score"].tolist() == [7.0, 0.0]
+    assert _errors(errors) == {(1, "Score", "not_numeric")}
+
+
+MIXED = pd.DataFrame({
+    "Price": ["25000", "abc", None, "-5", 1e9],
+    "Condition": ["Used", "new", None, " New ", "nan"],
+    "Production_year": [2015, 1800, 2020, 2010, 2005],
+    "Mileage_km": [150_000.0, np.nan, 0.0, 20_000_000.0, 1.5],
+    "Doors_number": ["5", "3-drzwiowe", None, "brak", 4.0],
+    "Offer_location": ["mazowieckie", "Berlin", "śląskie", None, ""],
+    "Features": ["ABS", None, "nan", "ESP", "ABS"],
+    "Extra_num": [1.5, np.nan, 2.0, 3.0, 4.0],
+    "Code": [101, 102, 103, 104, 105],
+})
+
+
+@pytest.mark.parametrize("only_known", [False, True])
+def test_small_and_vector_paths_agree(monkeypatch, only_known):
+    small, small_err = validate_frame(MIXED, cat_cols=["Code"], only_known=only_known)
+    monkeypatch.setattr(data_schema, "SMALL_FRAME_ROWS", 0)
+    vector, vector_err = validate_frame(MIXED, cat_cols=["Code"], only_known=only_known)
+
+    pd.testing.assert_frame_equal(small, vector)
+    key = ["column", "row", "error"]
+    pd.testing.assert_frame_equal(
+        small_err.sort_values(key).reset_index(drop=True).astype(object),
+        vector_err.sort_values(key).reset_index(drop=True).astype(object),
+    )
+
+
+def _baseline_features_row(user_input, cols, cat_cols, num_cols):
+    # dawne app.build_features_row (przed schematem) - punkt odniesienia
+    row = {c: user_input.get(c, MISSING_CAT if c in cat_cols else 0) for c in cols}
+    X_one = pd.DataFrame([row], columns=cols)
+    for c in cat_cols:
+        X_one[c] = X_one[c].astype(str).fillna(MISSING_CAT)
+    for c in num_cols:
+        X_one[c] = pd.to_numeric(X_one[c], errors="coerce").fillna(0)
+    return X_one
+
+
+def test_single_row_not_slower_than_baseline():
+    cols = [c for c in COLUMNS if c != "Price"] + ["Features"]
+    cat_cols = [c for c in cols if COLUMNS.get(c, {"kind": "cat"})["kind"] == "cat"]
+    num_cols = [c for c in cols if c not in cat_cols]
+    row = {
+        "Condition": "Used", "Vehicle_brand": "BMW", "Vehicle_model": "X5",
+        "Production_year": 2015, "Mileage_km": 120_000, "Power_HP": 249,
+        "Displacement_cm3": 2993, "Fuel_type": "Diesel", "Transmission": "Automatic",
+        "Doors_number": 5, "Offer_location": "mazowieckie",
+    }
+
+    def serving():
+        # jak valuation.build_features
+        X = pd.DataFrame([row]).reindex(columns=cols)
+        return validate_frame(X, cat_cols=cat_cols, num_cols=num_cols)
+
+    def baseline():
+        return _baseline_features_row(row, cols, cat_cols, num_cols)
+
+    best = {f.__name__: min(timeit.repeat(f, number=20, repeat=7)) for f in (serving, baseline)}
+    assert best["serving"] <= best["baseline"], best
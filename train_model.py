@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import joblib
@@ -8,6 +9,11 @@ from catboost import CatBoostRegressor, Pool
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 
+from data_schema import print_error_summary, validate_frame
+from market_stats import build_market_stats, save_market_stats
+from segments import SEGMENT_BY_CHOICES, SEGMENT_MODELS_FILE, predict_routed, segment_keys
+from telemetry import TrainingTelemetry
+
 
 USE_LOG_TARGET = True
 TEST_SIZE = 0.20
@@ -15,6 +21,33 @@ VALID_SIZE_FROM_TRAIN = 0.20
 
 DROP_COLS = {"Index"}
 
+MODEL_PARAMS = {
+    "loss_function": "RMSE",
+    "eval_metric": "RMSE",
+    "iterations": 10000,
+    "learning_rate": 0.03,
+    "depth": 8,
+    "l2_leaf_reg": 6,
+    "random_strength": 1.0,
+    "bagging_temperature": 0.5,
+    "rsm": 0.9,
+    "od_type": "Iter",
+    "od_wait": 300,
+    "random_state": 42,
+    "verbose": 200,
+    "allow_writing_files": False,
+}
+
+# Modele segmentowe (opcjonalne)
+MIN_SEGMENT_TRAIN_ROWS = 2000
+MIN_SEGMENT_BLEND_ROWS = 100
+BLEND_WEIGHTS = [0.0, 0.25, 0.5, 0.75, 1.0]
+# Wycinek X_train_full do wyboru wagi mieszania: żaden model go nie widzi
+# (global robi early stopping na X_valid, segmenty na SEGMENT_ES_HOLDOUT).
+BLEND_SIZE_FROM_TRAIN = 0.15
+# Early stopping modeli segmentowych na wycinku ich danych treningowych
+SEGMENT_ES_HOLDOUT = 0.15
+
 
 def fmt_pln(x: float) -> str:
     return f"{x:,.0f}".replace(",", " ")
@@ -24,136 +57,268 @@ def rmse(y_true, y_pred) -> float:
     return float(np.sqrt(mean_squared_error(y_true, y_pred)))
 
 
-def main(
-    data_path: str = "data/Car_sale_ads_cleaned_v2.csv",
-    model_dir: str = "models",
-    target: str = "Price",
-):
-    df = pd.read_csv(data_path)
+def _fit_segment(seg, X_train, y_train, X_blend, cat_feature_indices, params):
+    # Uruchamiane w osobnym procesie (ProcessPoolExecutor)
+    X_fit, X_es, y_fit, y_es = train_test_split(
+        X_train, y_train, test_size=SEGMENT_ES_HOLDOUT, random_state=42
+    )
+    fit_pool = Pool(X_fit, y_fit, cat_features=cat_feature_indices)
+    es_pool = Pool(X_es, y_es, cat_features=cat_feature_indices)
+    model = CatBoostRegressor(**params)
+    model.fit(fit_pool, eval_set=es_pool, use_best_model=True)
+    return seg, model, model.predict(Pool(X_blend, cat_features=cat_feature_indices))
+
+
+def train_segment_models(
+    segment_by: str,
+    X_train, y_train_fit, X_blend, y_blend_fit,
+    global_blend_pred,
+    cat_feature_indices: list,
+    workers: int = None,
+) -> dict:
+    train_keys = segment_keys(X_train, segment_by)
+    blend_keys = segment_keys(X_blend, segment_by)
+
+    counts = train_keys.value_counts()
+    segs = [
+        s for s, n in counts.items()
+        if n >= MIN_SEGMENT_TRAIN_ROWS and (blend_keys == s).sum() >= MIN_SEGMENT_BLEND_ROWS
+    ]
+    skipped = [s for s in counts.index if s not in segs]
+    print(f"\n[INFO] Segmenty ({segment_by}) do treningu: {segs}")
+    if skipped:
+        print(f"[INFO] Za małe segmenty (tylko model globalny): {skipped}")
+    if not segs:
+        return {"segment_by": segment_by, "models": {}, "weights": {}}
+
+    n_workers = workers or min(len(segs), os.cpu_count() or 1)
+    params = dict(MODEL_PARAMS, verbose=0, thread_count=max(1, (os.cpu_count() or 1) // n_workers))
+
+    models, weights = {}, {}
+    with ProcessPoolExecutor(max_workers=n_workers) as ex:
+        futures = []
+        for seg in segs:
+            tr = (train_keys == seg).to_numpy()
+            bl = (blend_keys == seg).to_numpy()
+            futures.append(ex.submit(
+                _fit_segment, seg,
+                X_train[tr], y_train_fit[tr], X_blend[bl],
+                cat_feature_indices, params,
+            ))
+
+        for fut in futures:
+            seg, model, seg_blend_pred = fut.result()
+            bl = (blend_keys == seg).to_numpy()
+            y_bl = np.asarray(y_blend_fit[bl], dtype=float)
+            g_bl = np.asarray(global_blend_pred[bl], dtype=float)
+
+            # Waga mieszania segment/global wybrana na X_blend, którego żaden
+            # z modeli nie widział (ani w fit, ani przy wyborze iteracji)
+            scores = {w: rmse(y_bl, w * seg_blend_pred + (1 - w) * g_bl) for w in BLEND_WEIGHTS}
+            best_w = min(scores, key=scores.get)
+            if best_w > 0.0:
+                # waga 0 = segment nic nie wnosi, nie zapisujemy go w paczce
+                models[seg] = model
+                weights[seg] = best_w
+            print(
+                f"[OK] Segment {seg}: best_it={model.get_best_iteration()} | "
+                f"blend RMSE global={scores[0.0]:.4f} segment={scores[1.0]:.4f} -> waga={best_w}"
+            )
+
+    return {"segment_by": segment_by, "models": models, "weights": weights}
+
+
+def _train(tel, data_path: str, model_dir: str, target: str, segment_by: str, segment_workers: int) -> dict:
+    with tel.phase("csv_load"):
+        df = pd.read_csv(data_path)
 
     if target not in df.columns:
         raise ValueError(f"Brak kolumny '{target}' w danych. Dostępne: {df.columns.tolist()}")
 
-    df = df[df[target].notna()].copy()
-
-    cols_to_drop = [c for c in DROP_COLS if c in df.columns]
-    if cols_to_drop:
-        df = df.drop(columns=cols_to_drop)
+    with tel.phase("coercion"):
+        df, schema_errors = validate_frame(df)
+        print_error_summary(schema_errors, "train_model")
 
-    X = df.drop(columns=[target]).copy()
-    y = df[target].astype(float).copy()
+        df = df[df[target].notna()].copy()
 
-    cat_cols = X.select_dtypes(include=["object", "category"]).columns.tolist()
-    num_cols = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
+        cols_to_drop = [c for c in DROP_COLS if c in df.columns]
+        if cols_to_drop:
+            df = df.drop(columns=cols_to_drop)
 
-    for c in cat_cols:
-        X[c] = X[c].astype(str).fillna("Brak danych")
-        X[c] = X[c].replace({"nan": "Brak danych", "None": "Brak danych"})
+        X = df.drop(columns=[target]).copy()
+        y = df[target].astype(float).copy()
 
-    for c in num_cols:
-        X[c] = pd.to_numeric(X[c], errors="coerce").fillna(0)
+        cat_cols = X.select_dtypes(include=["object", "category"]).columns.tolist()
+        num_cols = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
 
-    cat_feature_indices = [X.columns.get_loc(c) for c in cat_cols]
+        cat_feature_indices = [X.columns.get_loc(c) for c in cat_cols]
+    tel.emit("dataset", rows=len(X), features=X.shape[1], schema_errors=len(schema_errors))
 
     # SPLIT: train / valid / test
-    X_train_full, X_test, y_train_full, y_test = train_test_split(
-        X, y, test_size=TEST_SIZE, random_state=42
-    )
-
-    X_train, X_valid, y_train, y_valid = train_test_split(
-        X_train_full,
-        y_train_full,
-        test_size=VALID_SIZE_FROM_TRAIN,
-        random_state=42
-    )
-
-    # LOG TARGET
-    if USE_LOG_TARGET:
-        y_train_fit = np.log1p(y_train)
-        y_valid_fit = np.log1p(y_valid)
-    else:
-        y_train_fit = y_train
-        y_valid_fit = y_valid
-
-    train_pool = Pool(X_train, y_train_fit, cat_features=cat_feature_indices)
-    valid_pool = Pool(X_valid, y_valid_fit, cat_features=cat_feature_indices)
-    test_pool = Pool(X_test, cat_features=cat_feature_indices)
+    with tel.phase("split"):
+        X_train_full, X_test, y_train_full, y_test = train_test_split(
+            X, y, test_size=TEST_SIZE, random_state=42
+        )
+
+        X_train, X_valid, y_train, y_valid = train_test_split(
+            X_train_full,
+            y_train_full,
+            test_size=VALID_SIZE_FROM_TRAIN,
+            random_state=42
+        )
+
+        # Wycinek do wyboru wag mieszania (tylko przy modelach segmentowych)
+        X_blend, y_blend = None, None
+        if segment_by:
+            X_train, X_blend, y_train, y_blend = train_test_split(
+                X_train, y_train, test_size=BLEND_SIZE_FROM_TRAIN, random_state=42
+            )
+
+        # LOG TARGET
+        if USE_LOG_TARGET:
+            y_train_fit = np.log1p(y_train)
+            y_valid_fit = np.log1p(y_valid)
+            y_blend_fit = np.log1p(y_blend) if y_blend is not None else None
+        else:
+            y_train_fit = y_train
+            y_valid_fit = y_valid
+            y_blend_fit = y_blend
+
+    with tel.phase("pool_build"):
+        train_pool = Pool(X_train, y_train_fit, cat_features=cat_feature_indices)
+        valid_pool = Pool(X_valid, y_valid_fit, cat_features=cat_feature_indices)
+        test_pool = Pool(X_test, cat_features=cat_feature_indices)
 
     # MODEL
-    model = CatBoostRegressor(
-        loss_function="RMSE",
-        eval_metric="RMSE",
-        iterations=10000,
-        learning_rate=0.03,
-        depth=8,
-        l2_leaf_reg=6,
-        random_strength=1.0,
-        bagging_temperature=0.5,
-        rsm=0.9,
-        od_type="Iter",
-        od_wait=300,
-        random_state=42,
-        verbose=200,
-        allow_writing_files=False,
-    )
+    model = CatBoostRegressor(**MODEL_PARAMS)
 
-    model.fit(train_pool, eval_set=valid_pool, use_best_model=True)
+    with tel.phase("fit"):
+        model.fit(
+            train_pool,
+            eval_set=valid_pool,
+            use_best_model=True,
+            callbacks=[tel.catboost_callback("global")],
+        )
 
     best_it = model.get_best_iteration()
 
+    # MODELE SEGMENTOWE
+    segment_bundle = None
+    if segment_by:
+        with tel.phase("segment_fit"):
+            segment_bundle = train_segment_models(
+                segment_by,
+                X_train, y_train_fit, X_blend, y_blend_fit,
+                model.predict(Pool(X_blend, cat_features=cat_feature_indices)),
+                cat_feature_indices,
+                workers=segment_workers,
+            )
+
     # EWALUACJA NA TEST
-    pred_fit = model.predict(test_pool)
-
-    if USE_LOG_TARGET:
-        y_pred = np.expm1(pred_fit)
-    else:
-        y_pred = pred_fit
-
-    mae = float(mean_absolute_error(y_test, y_pred))
-    rmse_val = rmse(y_test, y_pred)
-    r2 = float(r2_score(y_test, y_pred))
-
-    print("\n===== CatBoost - wyniki na zbiorze testowym =====")
-    print(f"Best iteration: {best_it}")
-    print(f"R2:   {r2:.4f}")
-    print(f"MAE:  {mae:.2f}")
-    print(f"RMSE: {rmse_val:.2f}")
-
-    # feature importance
-    importances = model.get_feature_importance(train_pool)
-    fi_df = pd.DataFrame({"feature": X.columns, "importance": importances}).sort_values(
-        by="importance", ascending=False
-    )
-    print("\nTop 20 najważniejszych cech:")
-    print(fi_df.head(20).to_string(index=False))
+    with tel.phase("evaluation"):
+        pred_fit = model.predict(test_pool)
+
+        if USE_LOG_TARGET:
+            y_pred = np.expm1(pred_fit)
+        else:
+            y_pred = pred_fit
+
+        mae = float(mean_absolute_error(y_test, y_pred))
+        rmse_val = rmse(y_test, y_pred)
+        r2 = float(r2_score(y_test, y_pred))
+
+        print("\n===== CatBoost - wyniki na zbiorze testowym =====")
+        print(f"Best iteration: {best_it}")
+        print(f"R2:   {r2:.4f}")
+        print(f"MAE:  {mae:.2f}")
+        print(f"RMSE: {rmse_val:.2f}")
+
+        if segment_bundle and segment_bundle["models"]:
+            routed_fit = predict_routed(model, segment_bundle, X_test)
+            y_pred_routed = np.expm1(routed_fit) if USE_LOG_TARGET else routed_fit
+            print("\n===== Global + segmenty - wyniki na zbiorze testowym =====")
+            print(f"R2:   {r2_score(y_test, y_pred_routed):.4f}")
+            print(f"MAE:  {mean_absolute_error(y_test, y_pred_routed):.2f}")
+            print(f"RMSE: {rmse(y_test, y_pred_routed):.2f}")
+
+        # feature importance
+        importances = model.get_feature_importance(train_pool)
+        fi_df = pd.DataFrame({"feature": X.columns, "importance": importances}).sort_values(
+            by="importance", ascending=False
+        )
+        print("\nTop 20 najważniejszych cech:")
+        print(fi_df.head(20).to_string(index=False))
 
     # ZAPIS
-    Path(model_dir).mkdir(parents=True, exist_ok=True)
+    with tel.phase("dump"):
+        Path(model_dir).mkdir(parents=True, exist_ok=True)
+
+        model_path = os.path.join(model_dir, "catboost_price.joblib")
+        schema_path = os.path.join(model_dir, "feature_schema.joblib")
+
+        joblib.dump(model, model_path)
+
+        schema = {
+            "feature_columns": X.columns.tolist(),
+            "cat_cols": cat_cols,
+            "num_cols": num_cols,
+            "cat_feature_indices": cat_feature_indices,
+            "use_log_target": USE_LOG_TARGET,
+            "drop_cols": sorted(list(DROP_COLS)),
+            "best_iteration": int(best_it) if best_it is not None else None,
+            "model_params": model.get_params(),
+            "metrics": {"r2": r2, "mae": mae, "rmse": rmse_val},
+            "segment_by": segment_by if segment_bundle and segment_bundle["models"] else None,
+        }
+        joblib.dump(schema, schema_path)
+
+        if schema["segment_by"]:
+            segment_path = os.path.join(model_dir, SEGMENT_MODELS_FILE)
+            joblib.dump(segment_bundle, segment_path)
+            print(f"[OK] Zapisano modele segmentowe: {segment_path} | {sorted(segment_bundle['models'])}")
+
+        print(f"\n[OK] Zapisano model:  {model_path}")
+        print(f"[OK] Zapisano schema: {schema_path}")
+
+    # Statystyki rynkowe per segment (mediana/p10/p90) do podglądu w app.py
+    with tel.phase("market_stats"):
+        stats_path = os.path.join(model_dir, "market_stats.joblib")
+        save_market_stats(build_market_stats(df, target=target), stats_path)
 
-    model_path = os.path.join(model_dir, "catboost_price.joblib")
-    schema_path = os.path.join(model_dir, "feature_schema.joblib")
+    example_price = float(np.median(y_test))
+    print(f"\nPrzykładowo medianowa cena w teście: {fmt_pln(example_price)} PLN")
 
-    joblib.dump(model, model_path)
+    return {"best_iteration": schema["best_iteration"], "metrics": schema["metrics"]}
 
-    schema = {
-        "feature_columns": X.columns.tolist(),
-        "cat_cols": cat_cols,
-        "num_cols": num_cols,
-        "cat_feature_indices": cat_feature_indices,
-        "use_log_target": USE_LOG_TARGET,
-        "drop_cols": sorted(list(DROP_COLS)),
-        "best_iteration": int(best_it) if best_it is not None else None,
-        "model_params": model.get_params(),
-        "metrics": {"r2": r2, "mae": mae, "rmse": rmse_val},
-    }
-    joblib.dump(schema, schema_path)
 
-    print(f"\n[OK] Zapisano model:  {model_path}")
-    print(f"[OK] Zapisano schema: {schema_path}")
+def main(
+    data_path: str = "data/Car_sale_ads_cleaned_v2.csv",
+    model_dir: str = "models",
+    target: str = "Price",
+    segment_by: str = None,
+    segment_workers: int = None,
+):
+    tel = TrainingTelemetry(out_dir=os.path.join(model_dir, "telemetry"))
 
-    example_price = float(np.median(y_test))
-    print(f"\nPrzykładowo medianowa cena w teście: {fmt_pln(example_price)} PLN")
+    # Podsumowanie zapisujemy także dla nieudanych/przerwanych runów
+    status, extra = "failed", {}
+    try:
+        extra = _train(tel, data_path, model_dir, target, segment_by, segment_workers)
+        status = "ok"
+    except KeyboardInterrupt:
+        status = "interrupted"
+        raise
+    finally:
+        tel.close(status=status, **extra)
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Trening modelu CatBoost")
+    parser.add_argument("--segment-by", choices=SEGMENT_BY_CHOICES, default=None,
+                        help="Dodatkowo trenuj modele per segment")
+    parser.add_argument("--segment-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    main(segment_by=args.segment_by, segment_workers=args.segment_workers)
@@ -0,0 +1,291 @@
+# Stałe UI ładowane raz na proces (Streamlit przy każdym rerunie wykonuje app.py od nowa)
+
+APP_CSS = """
+<style>
+:root{
+  --bg: #F6F7FB;
+  --card: #FFFFFF;
+  --text: #0F172A;
+  --muted: #475569;
+  --border: #D7DDEA;
+
+  --blue: #004D98;
+  --maroon: #A50044;
+  --gold: #D4AF37;
+
+  --shadow: 0 2px 10px rgba(15, 23, 42, 0.08);
+}
+
+.stApp { background: var(--bg); color: var(--text); }
+.block-container { padding-top: 1.2rem; padding-bottom: 2rem; max-width: 1100px; }
+
+h1, h2, h3 { color: var(--text); }
+.subtitle { color: var(--muted); font-size: 0.98rem; margin-bottom: 1.2rem; }
+
+/* Sekcje jako karty */
+.section{
+  padding: 0.95rem 1.0rem;
+  border: 1px solid var(--border);
+  border-radius: 16px;
+  background: var(--card);
+  box-shadow: 0 1px 2px rgba(15, 23, 42, 0.05);
+  margin-bottom: 0.9rem;
+}
+
+/* Tytuł sekcji z akcentem */
+.section-title{
+  font-weight: 900;
+  margin-bottom: 0.6rem;
+  font-size: 1.02rem;
+  color: var(--blue);
+}
+.section-title::after{
+  display: none;
+  content: none;
+}
+
+
+/* Wynik */
+.result-card{
+  padding: 1.0rem 1.0rem;
+  border-radius: 18px;
+  border: 1px solid var(--border);
+  background: var(--card);
+  box-shadow: var(--shadow);
+  margin-top: 1.0rem;
+}
+.result-label{ color: var(--muted); font-size: 0.95rem; margin-bottom: 0.25rem; }
+.result-range{
+  font-size: 1.85rem;
+  font-weight: 950;
+  line-height: 1.15;
+  color: var(--maroon);
+}
+.result-note{ color: var(--muted); font-size: 0.92rem; margin-top: 0.5rem; }
+
+a, a:visited { color: var(--blue); }
+hr { border-color: var(--border); }
+
+/* Przycisk primary */
+button[kind="primary"]{
+  background: linear-gradient(90deg, var(--blue), var(--maroon)) !important;
+  color: white !important;
+  border-radius: 12px !important;
+  padding: 0.65rem 0.95rem !important;
+  font-weight: 900 !important;
+  border: 1px solid rgba(0,0,0,0) !important;
+  box-shadow: 0 6px 18px rgba(0, 77, 152, 0.20);
+}
+button[kind="primary"]:hover{
+  filter: brightness(0.97);
+}
+
+button[kind="secondary"]{
+  border-radius: 12px !important;
+  padding: 0.65rem 0.95rem !important;
+  font-weight: 800 !important;
+}
+
+/* Streamlit elementy */
+div[data-testid="stForm"] { border: none; padding: 0; }
+div[data-testid="stHorizontalBlock"] { gap: 0.8rem; }
+
+/* Poprawa czytelności captionów */
+.stCaption { color: var(--muted) !important; }
+
+.gold-badge{
+  display:inline-block;
+  padding: 0.15rem 0.5rem;
+  border-radius: 999px;
+  border: 1px solid rgba(212, 175, 55, 0.55);
+  background: rgba(212, 175, 55, 0.10);
+  color: #6B4E00;
+  font-weight: 800;
+  font-size: 0.85rem;
+}
+
+/* Kontenery Streamlit z border=True */
+div[data-testid="stVerticalBlockBorderWrapper"]{
+  background: var(--card) !important;
+  border: 1px solid var(--border) !important;
+  border-radius: 16px !important;
+  padding: 0.95rem 1rem !important;
+  box-shadow: 0 1px 2px rgba(15, 23, 42, 0.05) !important;
+}
+</style>
+"""
+
+
+# Zakresy pól liczbowych formularza (kwargs dla st.number_input)
+FORM_LIMITS = {
+    "Production_year":  {"min_value": 1915, "max_value": 2021, "value": 2006, "step": 1},
+    "Mileage_km":       {"min_value": 0, "max_value": 2_000_000, "value": 200_000, "step": 1000},
+    "Power_HP":         {"min_value": 0, "max_value": 1200, "value": 120, "step": 10},
+    "Displacement_cm3": {"min_value": 0, "max_value": 10_000, "value": 1600, "step": 100},
+    "Doors_number":     {"min_value": 0, "max_value": 10, "value": 5, "step": 1},
+}
+
+
+CATEGORICAL_OPTIONS = {
+    "Offer_location": [
+        "dolnośląskie", "kujawsko-pomorskie", "lubelskie", "lubuskie",
+        "małopolskie", "mazowieckie", "opolskie", "podkarpackie",
+        "podlaskie", "pomorskie", "śląskie", "świętokrzyskie",
+        "warmińsko-mazurskie", "wielkopolskie", "łódzkie",
+        "Brak danych",
+    ],
+    "Fuel_type": [
+        "Diesel", "Electric", "Ethanol", "Gasoline", "Gasoline + LPG",
+        "Hybrid", "LPG", "Natural Gas", "Brak danych",
+    ],
+    "Drive": [
+        "Front wheels", "4x4 (permanent)", "4x4 (automatic)",
+        "4x4 (connected manually)", "Rear wheels", "Brak danych",
+    ],
+    "Transmission": ["Automatic", "Manual"],
+    "Condition": ["New", "Used"],
+    "Type": [
+        "SUV", "Sedan", "Hatchback", "Station wagon", "Coupe",
+        "Van", "Convertible", "Pickup", "Small car", "Brak danych",
+    ],
+    "Colour": [
+        "Black", "White", "Gray", "Silver", "Blue", "Red", "Brown", "Green",
+        "Beige", "Gold", "Orange", "Yellow", "Purple", "Brak danych",
+    ],
+    "Origin_country": [
+        "Germany", "Poland", "Brak danych", "France", "Other",
+        "Belgium", "Netherlands",
+    ],
+    "First_owner": ["Yes", "Brak danych"],
+}
+
+TOP_BRANDS = [
+    "Volkswagen", "BMW", "Audi", "Opel", "Ford", "Mercedes-Benz", "Renault",
+    "Toyota", "Škoda", "Peugeot", "Citroën", "Volvo", "Kia", "Hyundai",
+    "Fiat", "Seat", "Nissan", "Mazda", "Honda", "Suzuki",
+    "Mitsubishi", "Jeep", "Dacia", "Chevrolet", "MINI", "Alfa Romeo",
+    "Land Rover", "Porsche", "Jaguar", "Lexus", "Subaru", "Chrysler",
+    "Dodge", "Saab", "Smart", "Infiniti", "Lancia", "SsangYong",
+    "Maserati", "Cadillac",
+]
+
+BRAND_TO_MODELS = {
+    "Volkswagen": [
+        "Golf", "Passat", "Polo", "Tiguan", "Touran", "Caddy", "Golf Plus",
+        "Arteon", "Sharan", "up!", "Jetta", "Transporter", "Touareg",
+        "T-Roc", "T-Cross", "Multivan", "Caravelle", "CC", "Scirocco",
+        "New Beetle", "Golf Sportsvan", "Passat CC", "Fox", "Bora", "Beetle",
+    ],
+    "BMW": [
+        "Seria 3", "Seria 5", "Seria 1", "X3", "X5", "Seria 7", "X1",
+        "Seria 2", "Seria 4", "X6", "i3", "3GT", "Seria 6", "X4", "X2",
+        "M5", "X5 M", "M3", "X7", "Seria 8", "X6 M", "5GT", "M4", "M8", "Z4",
+    ],
+    "Audi": [
+        "A4", "A6", "A3", "Q5", "A5", "A8", "Q7", "Q3", "A7", "A6 Allroad",
+        "A1", "A4 Allroad", "Q2", "TT", "S3", "Q8", "S5", "RS6", "SQ7",
+        "S6", "RS Q3", "S4", "SQ5", "A2", "S8",
+    ],
+    "Opel": [
+        "Astra", "Insignia", "Corsa", "Zafira", "Meriva", "Vectra", "Mokka",
+        "Vivaro", "Crossland X", "Grandland X", "Combo", "Signum", "Antara",
+        "Agila", "Tigra", "Adam", "Karl", "Omega", "Movano", "Frontera",
+        "Other", "Ampera", "Cascada", "Kadett", "Rekord",
+    ],
+    "Ford": [
+        "Focus", "Mondeo", "Fiesta", "S-Max", "Kuga", "C-MAX", "Mustang",
+        "Galaxy", "Fusion", "EcoSport", "Puma", "Grand C-MAX", "EDGE", "KA",
+        "Tourneo Custom", "B-MAX", "Ranger", "Transit", "Focus C-Max",
+        "Transit Custom", "Escape", "Explorer", "Tourneo Connect",
+        "Tourneo Courier", "Transit Connect",
+    ],
+    "Mercedes-Benz": [
+        "Klasa E", "Klasa C", "Klasa A", "Klasa S", "Klasa B", "CLA", "GLE",
+        "GLC", "CLS", "ML", "GLA", "SL", "Vito", "CLK",
+        "W124 (1984-1993)", "Other", "GL", "CL", "GLK", "Klasa V", "GLS",
+        "SLK", "Sprinter", "AMG GT", "Viano",
+    ],
+    "Renault": [
+        "Megane", "Clio", "Scenic", "Laguna", "Captur", "Grand Scenic",
+        "Kadjar", "Trafic", "Espace", "Talisman", "Twingo", "Modus",
+        "Kangoo", "Koleos", "Grand Espace", "Fluence", "Zoe", "Thalia",
+        "Master", "Latitude", "Vel Satis", "Other", "Scenic Conquest",
+        "Safrane", "19",
+    ],
+    "Toyota": [
+        "Avensis", "Yaris", "Corolla", "Auris", "RAV4", "C-HR", "Aygo",
+        "Verso", "Corolla Verso", "Prius", "Camry", "Land Cruiser",
+        "Proace City Verso", "Proace Verso", "Sienna", "Hilux", "ProAce",
+        "Verso S", "Highlander", "Celica", "Prius+", "Tundra", "Yaris Verso",
+        "Avensis Verso", "Supra",
+    ],
+    "Škoda": [
+        "Octavia", "Fabia", "Superb", "RAPID", "Scala", "Citigo", "Kodiaq",
+        "Karoq", "Roomster", "Yeti", "Kamiq", "Enyaq", "Felicia", "Praktik",
+        "105", "Favorit", "Forman", "130",
+    ],
+    "Peugeot": [
+        "308", "508", "3008", "208", "207", "5008", "2008", "407", "307",
+        "Partner", "206", "Rifter", "301", "107", "Expert", "307 CC", "807",
+        "207 CC", "206 plus", "Boxer", "1007", "206 CC", "RCZ", "607",
+        "Traveller",
+    ],
+    "Citroën": [
+        "C5", "C3", "C4", "C4 Picasso", "Berlingo", "C4 Grand Picasso",
+        "C5 Aircross", "C1", "C3 Picasso", "C3 Aircross", "Xsara Picasso",
+        "DS3", "C4 Cactus", "C2", "DS4", "DS5", "C-Elysée", "Jumpy Combi",
+        "C8", "Xsara", "Other", "SpaceTourer", "Jumper", "C4 Aircross",
+        "C-Crosser",
+    ],
+    "Volvo": [
+        "XC 60", "V40", "V60", "V50", "S60", "XC 90", "V70", "V90", "S80",
+        "S40", "XC 40", "S90", "C30", "XC 70", "C70", "Other", "850",
+        "Seria 900", "S70", "Seria 400", "340", "Seria 700", "262", "965",
+        "744",
+    ],
+    "Kia": [
+        "Ceed", "Sportage", "Picanto", "Rio", "Venga", "Optima", "Stonic",
+        "Sorento", "XCeed", "Carens", "Pro_cee'd", "Soul", "Niro", "Stinger",
+        "Carnival", "Magentis", "Other", "Cerato", "Opirus", "Shuma", "Joice",
+        "Sedona", "Clarus",
+    ],
+    "Hyundai": [
+        "I30", "Tucson", "ix35", "i20", "i40", "Kona", "Santa Fe", "i10",
+        "ix20", "Elantra", "Getz", "IONIQ", "Coupe", "Sonata", "i30 N",
+        "Veloster", "Matrix", "Accent", "Genesis Coupe", "Atos", "Terracan",
+        "H-1", "Galloper", "Other", "Genesis",
+    ],
+    "Fiat": [
+        "Tipo", "500", "Panda", "Grande Punto", "Bravo", "Punto", "Doblo",
+        "500X", "Punto Evo", "Freemont", "500L", "Sedici", "Croma", "Stilo",
+        "Ducato", "126", "Seicento", "Scudo", "Linea", "Fiorino", "Qubo",
+        "Punto 2012", "Cinquecento", "125p", "Talento",
+    ],
+    "Seat": [
+        "Leon", "Ibiza", "Altea", "Arona", "Altea XL", "Alhambra", "Toledo",
+        "Ateca", "Exeo", "Tarraco", "Mii", "Cordoba", "Arosa", "Marbella",
+        "Ronda",
+    ],
+    "Nissan": [
+        "Qashqai", "Juke", "Micra", "X-Trail", "Note", "Qashqai+2", "Leaf",
+        "Primera", "Almera", "Patrol", "Murano", "Navara", "Pulsar",
+        "Pathfinder", "Tiida", "Almera Tino", "NV200", "Pixo", "370 Z",
+        "Primastar", "GT-R", "Altima", "350 Z", "300 ZX", "Terrano",
+    ],
+    "Mazda": [
+        "6", "3", "CX-5", "5", "2", "CX-3", "CX-30", "MX-5", "CX-7", "CX-9",
+        "Premacy", "RX-8", "MX-30", "323F", "323", "Tribute", "626", "MPV",
+        "MX-3", "RX-7", "Demio", "121", "Other", "BT-50", "Xedos",
+    ],
+    "Honda": [
+        "Civic", "CR-V", "Accord", "Jazz", "HR-V", "FR-V", "Odyssey",
+        "Legend", "City", "Other", "Insight", "Prelude", "CR-Z", "CRX",
+        "Stream", "S 2000", "Pilot", "Ridgeline", "Integra",
+    ],
+    "Suzuki": [
+        "Swift", "Vitara", "SX4", "SX4 S-Cross", "Grand Vitara", "Ignis",
+        "Jimny", "Baleno", "Splash", "Alto", "Swace", "Liana", "Celerio",
+        "Samurai", "Wagon R+", "Across", "Kizashi", "Other", "X-90", "XL7",
+        "LJ", "SJ",
+    ],
+}
@@ -0,0 +1,40 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import MODEL_PATH, SCHEMA_PATH
+from data_schema import validate_frame
+from segments import SEGMENT_MODELS_FILE, predict_routed
+
+
+def load_artifacts(model_path: str = MODEL_PATH, schema_path: str = SCHEMA_PATH):
+    model = joblib.load(model_path)
+    schema = joblib.load(schema_path)
+
+    # modele segmentowe (opcjonalne, train_model.py --segment-by)
+    segment_bundle = None
+    if schema.get("segment_by"):
+        segment_path = os.path.join(os.path.dirname(schema_path), SEGMENT_MODELS_FILE)
+        segment_bundle = joblib.load(segment_path)
+    return model, schema, segment_bundle
+
+
+def build_features(rows: list[dict], schema: dict) -> tuple[pd.DataFrame, pd.DataFrame]:
+    X = pd.DataFrame(rows).reindex(columns=schema["feature_columns"])
+
+    return validate_frame(
+        X,
+        cat_cols=schema.get("cat_cols", []),
+        num_cols=schema.get("num_cols", []),
+    )
+
+
+def predict_prices(model, schema: dict, segment_bundle: dict, rows: list[dict]):
+    # Wspólna ścieżka predykcji dla app.py i load_test.py -> (ceny PLN, X, błędy)
+    X, errors = build_features(rows, schema)
+    pred = predict_routed(model, segment_bundle, X)
+    if schema.get("use_log_target", False):
+        pred = np.expm1(pred)
+    return pred, X, errors